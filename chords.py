@@ -43,8 +43,12 @@ class Chords(object):
     def named_chord(self, chord_name: str, tonic: str,
                     direction: bool = UP, mirrored: bool = False):
         validate_str(chord_name, 'chord_name')
-        if chord_name.lower() not in self.named_chords:
-            raise ValueError('chord_name is not in dictionary of known chords')
+        # Only lower() names that aren't already a known (lowercase) chord
+        if chord_name not in self.named_chords:
+            chord_name = chord_name.lower()
+            if chord_name not in self.named_chords:
+                raise ValueError('chord_name is not in dictionary of known '
+                                 'chords')
         return self.chord_stacked(tonic, self.named_chords[chord_name],
                                   direction, mirrored)
 
@@ -61,11 +65,14 @@ class Chords(object):
 
     ###########################################################################
 
+    # Skipping the named_chord lookup/validation, the names are known here
     def major(self, tonic: str, direction: bool = UP, mirrored: bool = False):
-        return self.named_chord('major', tonic, direction, mirrored)
+        return self.chord_stacked(tonic, self.named_chords['major'],
+                                  direction, mirrored)
 
     def minor(self, tonic: str, direction: bool = UP, mirrored: bool = False):
-        return self.named_chord('minor', tonic, direction, mirrored)
+        return self.chord_stacked(tonic, self.named_chords['minor'],
+                                  direction, mirrored)
 
 ###############################################################################
 
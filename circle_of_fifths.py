@@ -8,8 +8,9 @@
 Circle of fifths and key signature helpers
 """
 
+from sys import intern
 from typing import Optional, Dict
-from core import get_keys_for_value, validate_int, validate_str, SimpleDict
+from core import invert_dict, validate_int, validate_str, SimpleDict
 from twelve_tone import ChromaticMapNotation, ALPHABET, ACCIDENTALS, \
                         SOLFEGE, UNICODE_ACC
 
@@ -17,44 +18,57 @@ ALPHA_TO_SOLFEGE = list(zip(ALPHABET.keys(), [s.upper() for s in SOLFEGE]))
 ACCIDENTAL_TO_UNI = list(zip(ACCIDENTALS.keys(), UNICODE_ACC.keys()))
 
 
-def _fancy_replace(key: str, use_reversed: bool, upper_lower: bool,
-                   zip_list: list) -> str:
-    alpha_change = 'upper' if upper_lower else 'lower'
-    for curr, replacement in zip_list:
-        curr_name = getattr(curr, alpha_change)()
+def _cased_pairs(zip_list: list, upper_lower: bool) -> tuple:
+    alpha_change = str.upper if upper_lower else str.lower
+    return tuple((alpha_change(curr), alpha_change(replacement))
+                 for curr, replacement in zip_list)
+
+
+# (current, replacement) name pairs already in upper/lower case for the keys
+UPPER_SOLFEGE_PAIRS = _cased_pairs(ALPHA_TO_SOLFEGE, True)
+LOWER_SOLFEGE_PAIRS = _cased_pairs(ALPHA_TO_SOLFEGE, False)
+ACCIDENTAL_TO_UNI_TABLE = str.maketrans(dict(ACCIDENTAL_TO_UNI))
+
+
+# NOTE: Generated key names are interned like the literal keys in the source
+# so key lookups can compare by identity before comparing characters.
+def _fancy_replace(key: str, pairs: tuple) -> str:
+    for curr_name, new_name in pairs:
         if curr_name in key:
-            new_name = getattr(replacement, alpha_change)()
-            if use_reversed:
-                # Only replace one accidental off the back, solves the b vs ♭
-                # problem but is limited to this implementation (no doubles)
-                rev = ''.join(reversed(key)).replace(curr_name, new_name, 1)
-                return ''.join(reversed(rev))
-            return key.replace(curr_name, new_name, 1)
+            return intern(key.replace(curr_name, new_name, 1))
     return key
 
 
+def _unicode_accidental(key: str) -> str:
+    # Only the last character can be an accidental (no doubles) and a single
+    # character is always the note name, e.g. 'b' (note) vs 'bb' (note, flat)
+    if len(key) < 2:
+        return key
+    return intern(key[:-1] + key[-1].translate(ACCIDENTAL_TO_UNI_TABLE))
+
+
 DEFAULT_FIFTHS = {'C': 0, 'G': 1, 'D': 2, 'A': 3, 'E': 4, 'B': 5, 'Cb': -7,
                   'F#': 6, 'Gb': -6, 'C#': 7, 'Db': -5, 'Ab': -4, 'Eb': -3,
                   'Bb': -2, 'F': -1}
 DEFAULT_MINORS = {'a': 0, 'e': 1, 'b': 2, 'f#': 3, 'c#': 4, 'g#': 5, 'ab': -7,
                   'd#': 6, 'eb': -6, 'a#': 7, 'bb': -5, 'f': -4, 'c': -3,
                   'g': -2, 'd': -1}
-UNICODE_FIFTHS = {_fancy_replace(key, True, True, ACCIDENTAL_TO_UNI): value
+UNICODE_FIFTHS = {_unicode_accidental(key): value
                   for key, value in DEFAULT_FIFTHS.items()}
-UNICODE_MINORS = {_fancy_replace(key, True, False, ACCIDENTAL_TO_UNI): value
+UNICODE_MINORS = {_unicode_accidental(key): value
                   for key, value in DEFAULT_MINORS.items()}
-SOLFEGE_FIFTHS = {_fancy_replace(key, False, True, ALPHA_TO_SOLFEGE): value
+SOLFEGE_FIFTHS = {_fancy_replace(key, UPPER_SOLFEGE_PAIRS): value
                   for key, value in DEFAULT_FIFTHS.items()}
-SOLFEGE_MINORS = {_fancy_replace(key, False, False, ALPHA_TO_SOLFEGE): value
+SOLFEGE_MINORS = {_fancy_replace(key, LOWER_SOLFEGE_PAIRS): value
                   for key, value in DEFAULT_MINORS.items()}
-U_SOLFEGE_FIFTHS = {_fancy_replace(key, True, True, ACCIDENTAL_TO_UNI): value
+U_SOLFEGE_FIFTHS = {_unicode_accidental(key): value
                     for key, value in SOLFEGE_FIFTHS.items()}
-U_SOLFEGE_MINORS = {_fancy_replace(key, True, False, ACCIDENTAL_TO_UNI): value
+U_SOLFEGE_MINORS = {_unicode_accidental(key): value
                     for key, value in SOLFEGE_MINORS.items()}
 ###############################################################################
 ORDER_OF_FLATS = ['B', 'E', 'A', 'D', 'G', 'C', 'F']
 
-S_ORDER_OF_FLATS = [_fancy_replace(key, False, True, ALPHA_TO_SOLFEGE)
+S_ORDER_OF_FLATS = [_fancy_replace(key, UPPER_SOLFEGE_PAIRS)
                     for key in ORDER_OF_FLATS]
 ###############################################################################
 
@@ -65,17 +79,48 @@ class CircleOfFifths(object):
                  fifths: SimpleDict = DEFAULT_FIFTHS,
                  minors: SimpleDict = DEFAULT_MINORS,
                  order_of_flats: list = ORDER_OF_FLATS,
-                 upper_lower: bool = True):
+                 upper_lower: bool = True, using_unicode: bool = False):
         if not isinstance(notation, ChromaticMapNotation):
             raise TypeError('notation must be of type ChromaticMapNotation')
         self.notation = notation
         self.fifths = fifths
         self.minors = minors
+        # Reverse indices (num accidentals -> key names) for relative(...)
+        self._fifths_by_num = invert_dict(fifths)
+        self._minors_by_num = invert_dict(minors)
         self.order_of_flats = order_of_flats
         self.order_of_sharps = order_of_flats[::-1]
+        # Key signatures indexed by their number of sharps/flats
+        self._sharps_by_num = [self.order_of_sharps[:num]
+                               for num in range(len(order_of_flats) + 1)]
+        self._flats_by_num = [self.order_of_flats[:num]
+                              for num in range(len(order_of_flats) + 1)]
         self.alpha_change = 'upper' if upper_lower else 'lower'
-        self.using_unicode = False
+        self._change_case = str.upper if upper_lower else str.lower
         self.current_key_name = None
+        # Key names are a small closed set, memoize the parsing heavy helpers
+        self._tonic_cache = {}
+        # Also sets the sharp and flat symbols and (re)builds the caches that
+        # use them
+        self.using_unicode = using_unicode
+        # tonic value -> key name indices, built on first use in parallel(...)
+        self._fifths_by_tonic = None
+        self._minors_by_tonic = None
+
+    @property
+    def using_unicode(self) -> bool:
+        return self._using_unicode
+
+    @using_unicode.setter
+    def using_unicode(self, using_unicode: bool):
+        self._using_unicode = using_unicode
+        self._sharp, self._flat = ('♯', '♭') if using_unicode else ('#', 'b')
+        # Everything cached with the old symbols has to go
+        self._accidentals_cache = {}
+        self._notes_in_key_cache = {}
+        self._notes_set_cache = {}
+        # num accidentals -> notes of that key signature sorted by value
+        self._key_templates = {}
 
     ###########################################################################
 
@@ -85,10 +130,8 @@ class CircleOfFifths(object):
 
     @classmethod
     def unicode(cls):
-        temp = cls(ChromaticMapNotation.unicode(),
-                   UNICODE_FIFTHS, UNICODE_MINORS)
-        temp.using_unicode = True
-        return temp
+        return cls(ChromaticMapNotation.unicode(), UNICODE_FIFTHS,
+                   UNICODE_MINORS, using_unicode=True)
 
     @classmethod
     def solfege(cls):
@@ -97,17 +140,14 @@ class CircleOfFifths(object):
 
     @classmethod
     def s_unicode(cls):
-        temp = cls(ChromaticMapNotation.s_unicode(),
-                   U_SOLFEGE_FIFTHS, U_SOLFEGE_MINORS, S_ORDER_OF_FLATS, False)
-        temp.using_unicode = True
-        return temp
+        return cls(ChromaticMapNotation.s_unicode(), U_SOLFEGE_FIFTHS,
+                   U_SOLFEGE_MINORS, S_ORDER_OF_FLATS, False, True)
 
     ###########################################################################
 
     def set_current_key_name(self, new_key_name: str):
-        major_check = new_key_name in self.fifths.keys()
-        minor_check = new_key_name in self.minors.keys()
-        if not any((major_check, minor_check)):
+        if new_key_name not in self.fifths and \
+                new_key_name not in self.minors:
             raise KeyError('key_name not in circle of fifths')
         self.current_key_name = new_key_name
 
@@ -115,72 +155,104 @@ class CircleOfFifths(object):
 
     def _get_upper_lower(self, note_name: str):
         if note_name[-1] == 'b':
-            return getattr(note_name[:-1], self.alpha_change)() + 'b'
-        return getattr(note_name, self.alpha_change)()
+            return self._change_case(note_name[:-1]) + 'b'
+        return self._change_case(note_name)
 
     ###########################################################################
 
     def parallel(self, key_name: Optional[str] = None):
         if self.current_key_name and not key_name:
             key_name = self.current_key_name
-        if key_name in self.fifths.keys():
-            return self._get_parallel(key_name, self.minors)
-        if key_name in self.minors.keys():
-            return self._get_parallel(key_name, self.fifths)
+        if key_name in self.fifths:
+            if self._minors_by_tonic is None:
+                self._minors_by_tonic = self._index_by_tonic(self.minors)
+            return self._get_parallel(key_name, self._minors_by_tonic)
+        if key_name in self.minors:
+            if self._fifths_by_tonic is None:
+                self._fifths_by_tonic = self._index_by_tonic(self.fifths)
+            return self._get_parallel(key_name, self._fifths_by_tonic)
         raise KeyError('key_name not in circle of fifths')
 
-    def _get_parallel(self, key_name: str, major_minor: Dict):
+    def _get_parallel(self, key_name: str, keys_by_tonic: Dict):
         tonic = self._get_tonic_value(key_name)
-        parallels = []
+        if tonic not in keys_by_tonic:
+            raise KeyError('key_name has no parallel key in circle of fifths')
+        return keys_by_tonic[tonic]
+
+    def _index_by_tonic(self, major_minor: Dict) -> Dict:
+        # NOTE: Keeping the first key found for each tonic (in dict order),
+        # same as the linear search this index replaces.
+        keys_by_tonic = {}
         for key in major_minor:
-            if tonic == self._get_tonic_value(key):
-                parallels.append(key)
-        return parallels[0]
+            keys_by_tonic.setdefault(self._get_tonic_value(key), key)
+        return keys_by_tonic
 
     def _get_tonic_value(self, tonic: str):
-        note_name, accidentals, _ = self.notation.process_note(tonic)
-        new_name = self._get_upper_lower(note_name)
-        note_name = (new_name + accidentals) if accidentals else new_name
-        return self.notation.string_to_value(note_name)
+        if tonic not in self._tonic_cache:
+            note_name, accidentals, _ = self.notation.process_note(tonic)
+            new_name = self._get_upper_lower(note_name)
+            note_name = (new_name + accidentals) if accidentals else new_name
+            self._tonic_cache[tonic] = self.notation.string_to_value(note_name)
+        return self._tonic_cache[tonic]
 
     ###########################################################################
 
     def relative(self, key_name: Optional[str] = None):
         if self.current_key_name and not key_name:
             key_name = self.current_key_name
-        if key_name in self.fifths.keys():
+        if key_name in self.fifths:
             return self._get_key_name_by_num(self.fifths[key_name],
-                                             self.minors)
-        if key_name in self.minors.keys():
+                                             self._minors_by_num)
+        if key_name in self.minors:
             return self._get_key_name_by_num(self.minors[key_name],
-                                             self.fifths)
+                                             self._fifths_by_num)
         raise KeyError('key_name not in circle of fifths')
 
-    def _get_key_name_by_num(self, num_accidentals: int, major_minor: Dict):
+    @staticmethod
+    def _get_key_name_by_num(num_accidentals: int, keys_by_num: Dict):
         validate_int(num_accidentals, 'num_accidentals')
         if abs(num_accidentals) > 7:
             raise ValueError('No key signatures with more than 7 accidentals')
-        return get_keys_for_value(num_accidentals, major_minor)[0]
+        return keys_by_num[num_accidentals][0]
 
     ###########################################################################
 
     def notes_in_key(self, key_name: Optional[str] = None):
         if self.current_key_name and not key_name:
             key_name = self.current_key_name
-        accidental, accidentals = self._get_accidentals(key_name)
-        notes = list(set(self.order_of_flats) - set(accidentals))
-        accidentals = [note + accidental for note in accidentals]
-        notes = sorted(notes + accidentals, key=self._get_tonic_value)
-        notes = [self._get_upper_lower(note) for note in notes]
+        if key_name not in self._notes_in_key_cache:
+            notes = self._get_notes_in_key(key_name)
+            self._notes_in_key_cache[key_name] = notes
+        # Copy so callers can't modify the cached list
+        return list(self._notes_in_key_cache[key_name])
+
+    def _get_notes_in_key(self, key_name: str):
+        key_value = self._get_key_signature_value(key_name)
+        if key_value not in self._key_templates:
+            self._key_templates[key_value] = self._get_key_template(key_value)
+        notes = self._key_templates[key_value]
         note_index = notes.index(self._get_upper_lower(key_name))
         return notes[note_index:] + notes[:note_index]
 
+    def _get_key_template(self, num_accidentals: int):
+        # Same notes for every key sharing a key signature, only the starting
+        # note differs between them
+        accidental = self._sharp if num_accidentals >= 0 else self._flat
+        accidentals = self._get_key_signature_by_value(num_accidentals)
+        notes = [note + accidental if note in accidentals else note
+                 for note in self.order_of_flats]
+        notes = sorted(notes, key=self._get_tonic_value)
+        return [self._get_upper_lower(note) for note in notes]
+
     def note_in_key(self, note_name: str, key_name: Optional[str] = None):
         # note_name should be in standard upper_lower for the given notation...
         if self.current_key_name and not key_name:
             key_name = self.current_key_name
         validate_str(note_name, 'note_name')
-        return note_name in self.notes_in_key(key_name)
+        if key_name not in self._notes_set_cache:
+            notes = frozenset(self.notes_in_key(key_name))
+            self._notes_set_cache[key_name] = notes
+        return note_name in self._notes_set_cache[key_name]
 
     def get_key_signature(self, key_name: Optional[str] = None):
         if self.current_key_name and not key_name:
@@ -191,28 +263,26 @@ class CircleOfFifths(object):
         return [self._get_upper_lower(note) for note in notes]
 
     def _get_accidentals(self, key_name: str):
-        key_value = self._get_key_signature_value(key_name)
-        if self.using_unicode:
-            accidental = '♯' if key_value >= 0 else '♭'
-        accidental = '#' if key_value >= 0 else 'b'
-        accidentals = self._get_key_signature_by_value(key_value)
-        return accidental, accidentals
+        if key_name not in self._accidentals_cache:
+            key_value = self._get_key_signature_value(key_name)
+            accidental = self._sharp if key_value >= 0 else self._flat
+            accidentals = self._get_key_signature_by_value(key_value)
+            self._accidentals_cache[key_name] = accidental, accidentals
+        return self._accidentals_cache[key_name]
 
     def _get_key_signature_value(self, key_name: str):
         if key_name[0].islower():
-            if key_name not in self.minors.keys():
+            if key_name not in self.minors:
                 raise KeyError('key_name not in circle of fifths')
             return self.minors[key_name]
-        if key_name not in self.fifths.keys():
+        if key_name not in self.fifths:
             raise KeyError('key_name not in circle of fifths')
         return self.fifths[key_name]
 
     def _get_key_signature_by_value(self, num_accidentals: int):
-        if num_accidentals == 0:
-            return []
-        if num_accidentals > 0:
-            return self.order_of_sharps[:num_accidentals]
-        return self.order_of_flats[:abs(num_accidentals)]
+        if num_accidentals >= 0:
+            return self._sharps_by_num[num_accidentals]
+        return self._flats_by_num[-num_accidentals]
 
 ###############################################################################
 
@@ -8,6 +8,6 @@ from .validation import dict_with_ints, validate_bool, validate_dict, \
                         OptionalRatioList, OptionalOutputList, OutputTypes, \
                         Ratio, SimpleDict, SortedAccidentals, TuningStandard, \
                         ValidDict
-from .utils import compare_ratios, get_keys_for_value,\
+from .utils import compare_ratios, get_keys_for_value, invert_dict, \
                    ratio_divid, ratio_times, ratio_to_cents, \
                    sort_dict_by_value, wrap_octave, simplify_ratio, limit_ratio
@@ -8,11 +8,9 @@
 Misc. utility functions
 """
 
-from heapq import nsmallest
-from itertools import combinations_with_replacement, permutations
-from math import log  # for calculating cents
-# using itemgetter to sort dicts based on their values, (1, 0)
-from operator import itemgetter, truediv
+from bisect import bisect_left
+from math import gcd, log  # log for calculating cents
+from operator import truediv
 from .validation import OutputTypes, Ratio, validate_int, validate_ratio
 
 
@@ -23,24 +21,33 @@ def get_keys_for_value(value: OutputTypes, dictionary: dict) -> list:
     # NOTE: Not doing any validation on the args because this is so generic
     # that given any dictionary and value the function will already 'safely'
     # return an empty list if there were no value matches.
-    # NOTE: Relying on dictionaries having a 'static' order,
-    # i.e. lists based on keys or valuse etc can be indexed identically.
-    indicies = [i for i, (_, v) in enumerate(dictionary.items()) if v == value]
-    # "The objects returned by dict.keys() ... are view objects. They provide a
-    # dynamic view on the dictionary’s entries..."
-    # https://docs.python.org/3.10/library/stdtypes.html#dict-views
-    # Basically, keys returns something like a list but not really a list.
-    return [list(dictionary.keys())[index] for index in indicies]
+    return [key for key, val in dictionary.items() if val == value]
+
+
+def invert_dict(dictionary: dict) -> dict:
+    """Build a reverse index of the given dictionary, mapping each value to
+    the list of its associated key(s) - i.e. get_keys_for_value for every
+    value at once. Use when the same (static) dict is searched repeatedly.
+    """
+    # NOTE: Keys are appended in dictionary order, so inverse[value][0] is the
+    # same key that get_keys_for_value(value, dictionary)[0] would return.
+    inverse = {}
+    for key, value in dictionary.items():
+        inverse.setdefault(value, []).append(key)
+    return inverse
 
 
 def sort_dict_by_value(dictionary: dict) -> dict:
     """Sorts a dict based on its values, accounts for ratios of ints"""
-    def _fancy_itemgetter(dict_item):
-        value, note_name = itemgetter(1, 0)(dict_item)
-        if isinstance(value, (tuple)):
-            return (truediv(*value), note_name)
-        return value, note_name
-    return dict(sorted(dictionary.items(), key=_fancy_itemgetter))
+    return dict(sorted(dictionary.items(), key=_value_sort_key))
+
+
+def _value_sort_key(dict_item: tuple) -> tuple:
+    # Sort on (value, key), ratios sort on their value as a float
+    key, value = dict_item
+    if isinstance(value, tuple):
+        return (truediv(*value), key)
+    return (value, key)
 
 
 ###############################################################################
@@ -51,7 +58,7 @@ def wrap_octave(value: int, divisions: int) -> int:
     """
     validate_int(value, 'value')
     validate_int(divisions, 'divisions')
-    return (value + divisions) % divisions
+    return value % divisions  # % already wraps negative values up
 
 
 ###############################################################################
@@ -69,6 +76,11 @@ def ratio_to_cents(ratio: Ratio) -> float:
     where a and b are the first and second ints in the ratio respectively.
     """
     validate_ratio(ratio, 'ratio')
+    return _ratio_to_cents(ratio)
+
+
+def _ratio_to_cents(ratio: Ratio) -> float:
+    # Unvalidated ratio_to_cents for ratios that were generated internally
     return 1200 * log(truediv(*ratio), 2)
 
 
@@ -78,30 +90,36 @@ def compare_ratios(ratio1: Ratio, ratio2: Ratio) -> bool:
     """
     validate_ratio(ratio1, 'ratio1')
     validate_ratio(ratio2, 'ratio2')
-    return limit_ratio(ratio1) == limit_ratio(ratio2)
+    return _limit_ratio(ratio1) == _limit_ratio(ratio2)
 
 
 def limit_ratio(ratio: Ratio):
     """Transform a ratio to be within one octave (1 >= ratio <= 2)"""
     validate_ratio(ratio, 'ratio')
-    simple_ratio = simplify_ratio(ratio)
-    args = (simple_ratio, (2, 1))
-    ratio_value = truediv(*simple_ratio)
-    if ratio_value < 1.0:
-        return limit_ratio(ratio_times(*args))
-    if ratio_value > 2.0:
-        return limit_ratio(ratio_divid(*args))
-    return simple_ratio
+    return _limit_ratio(ratio)
+
+
+def _limit_ratio(ratio: Ratio) -> Ratio:
+    # Unvalidated limit_ratio for ratios that have already been validated
+    numerator, denominator = simplify_ratio(ratio)
+    # Shifting by all the octaves at once, the difference in bit lengths gets
+    # within one octave of the target and a single extra shift corrects that.
+    if numerator < denominator:
+        numerator <<= denominator.bit_length() - numerator.bit_length()
+        if numerator < denominator:
+            numerator <<= 1
+    elif numerator > denominator * 2:
+        # Ratios above the octave only come down as far as 2 (4:1 -> 2:1)
+        denominator <<= numerator.bit_length() - denominator.bit_length()
+        if numerator <= denominator:
+            denominator >>= 1
+    return simplify_ratio((numerator, denominator))
 
 
 def simplify_ratio(ratio: Ratio) -> Ratio:
     """Divids both terms in the ratio by their gcd"""
-    # pylint: disable=invalid-name
-    def _gcd(a: int, b: int) -> int:
-        while b:
-            a, b = b, a % b
-        return a
-    return tuple(i // _gcd(*ratio) for i in ratio)
+    divisor = gcd(*ratio)
+    return (ratio[0] // divisor, ratio[1] // divisor)
 
 
 def ratio_times(ratio1: Ratio, ratio2: Ratio) -> Ratio:
@@ -143,30 +161,44 @@ def prime_limited_ratios(power_limit: int = 3, num_primes: int = 3,
                          ratio_filter=_in_octave_range):
     primes = PRIMES[:num_primes]  # allow for any int, - or > len...
     # NOTE: Nothing happens if num_primes is negative with abs() > len(PRIMES)
-    valid_ratios = set()
-    for powers in set(power_perm for combo in
-                      combinations_with_replacement(range(-power_limit,
-                                                          power_limit + 1),
-                                                    len(primes))
-                      for power_perm in permutations(combo)):
-        new_ratio = [1, 1]  # tuples can't do assignment, but lists can
-        for prime, power in zip(primes, powers):
-            new_ratio[0 if power > 0 else 1] *= prime ** abs(power)
-        if ratio_filter(new_ratio):
-            valid_ratios.add((*new_ratio,))  # faster than tuple(...)
-    return sorted(list(valid_ratios), key=lambda r: truediv(*r))
+    powers = range(-power_limit, power_limit + 1)
+    ratios = [(1, 1)]
+    # Every vector of powers is a distinct ratio (unique prime factorization)
+    # so there are no duplicates, build the products up one prime at a time.
+    for prime in primes:
+        factors = [(prime ** power, 1) if power > 0 else (1, prime ** -power)
+                   for power in powers]
+        ratios = [(numerator * factor_num, denominator * factor_den)
+                  for numerator, denominator in ratios
+                  for factor_num, factor_den in factors]
+    return sorted(filter(ratio_filter, ratios), key=lambda r: truediv(*r))
 
 
 def make_cent_ratio_dict(power_limit: int = 3, num_primes: int = 3,
                          _filter=_in_octave_range):
-    return {ratio_to_cents(r): r for r in
+    # prime_limited_ratios only builds valid ratios, no need to validate
+    return {_ratio_to_cents(r): r for r in
             prime_limited_ratios(power_limit, num_primes,
                                  ratio_filter=_filter)}
 
 
 def closest_k(k: int, target: float, cent_ratio_dict: dict):
-    return nsmallest(k, cent_ratio_dict.items(),
-                     key=lambda v: abs(v[0] - target))
+    # NOTE: sorting is linear for the (already in order) cents keys built by
+    # make_cent_ratio_dict, after which the k closest are found by walking
+    # outwards from where the target would be inserted.
+    cents = sorted(cent_ratio_dict)
+    above = bisect_left(cents, target)
+    below = above - 1
+    closest = []
+    while len(closest) < k and (below >= 0 or above < len(cents)):
+        if above >= len(cents) or (below >= 0 and target - cents[below]
+                                   <= cents[above] - target):
+            closest.append(cents[below])
+            below -= 1
+        else:
+            closest.append(cents[above])
+            above += 1
+    return [(cent, cent_ratio_dict[cent]) for cent in closest]
 
 ###############################################################################
 # def get_prime_factors(value: int):
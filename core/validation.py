@@ -34,11 +34,15 @@ ValidDict = Dict[str, OutputTypes]
 ###############################################################################
 
 
+# NOTE: Validation is wrapped in `if __debug__:` blocks so that running with
+# python -O (__debug__ == False) strips the checks out of the hot paths.
+
 # Not validating the variable_name string, this is an internal use function...
 def validate(data_type: type, variable: Any, variable_name: str):
-    if not isinstance(variable, data_type):
-        type_name = data_type.__name__
-        raise TypeError(f'{variable_name} must be of type {type_name}')
+    if __debug__:
+        if not isinstance(variable, data_type):
+            type_name = data_type.__name__
+            raise TypeError(f'{variable_name} must be of type {type_name}')
 
 ###############################################################################
 
@@ -62,40 +66,45 @@ def validate_str(variable: str, variable_name: str):
 
 
 def validate_ratio(ratio: Ratio, ratio_name: str):
-    validate(tuple, ratio, ratio_name)
-    _validate_ratio(ratio, f'{ratio_name} must be of type tuple(int, int) '
-                    'where both ints are positive and non-zero')
+    if __debug__:
+        validate(tuple, ratio, ratio_name)
+        if not _is_ratio(ratio):
+            raise TypeError(f'{ratio_name} must be of type tuple(int, int) '
+                            'where both ints are positive and non-zero')
 
 
-def _validate_ratio(ratio: Ratio, error_message: str):
-    all_pos_non_zero_ints = all([isinstance(i, int) and i > 0 for i in ratio])
-    if len(ratio) != 2 or not all_pos_non_zero_ints:
-        raise TypeError(f'{error_message}')
+def _is_ratio(ratio: Ratio) -> bool:
+    # Unrolled for the fixed length, no list or generator for all(...)
+    return len(ratio) == 2 and isinstance(ratio[0], int) and \
+        isinstance(ratio[1], int) and ratio[0] > 0 and ratio[1] > 0
 
 
 def validate_dict(dictionary: ValidDict, dict_name: str):
-    validate(dict, dictionary, dict_name)
-    valid_dict_text = 'must be a dict with values of the type int, float, or '\
-                      'a "Ratio" (tuple(int, int) where both ints are > 0)'
-    if not all([isinstance(key, str) for key in dictionary.keys()]):
-        raise TypeError(f'{dict_name} must be a dict with str keys')
-    for value in dictionary.values():
-        if isinstance(value, tuple):
-            _validate_ratio(value, f'{dict_name} {valid_dict_text}')
-        elif not any([isinstance(value, int), isinstance(value, float)]):
-            raise TypeError(f'{dict_name} {valid_dict_text}')
+    if __debug__:
+        validate(dict, dictionary, dict_name)
+        valid_dict_text = 'must be a dict with values of the type int, ' \
+            'float, or a "Ratio" (tuple(int, int) where both ints are > 0)'
+        if not all(isinstance(key, str) for key in dictionary):
+            raise TypeError(f'{dict_name} must be a dict with str keys')
+        for value in dictionary.values():
+            if isinstance(value, tuple):
+                if not _is_ratio(value):
+                    raise TypeError(f'{dict_name} {valid_dict_text}')
+            elif not isinstance(value, (int, float)):
+                raise TypeError(f'{dict_name} {valid_dict_text}')
 
 
 def dict_with_ints(dictionary: dict):
-    return all([isinstance(val, int) for val in dictionary.values()])
+    return all(isinstance(val, int) for val in dictionary.values())
 
 
 def validate_simple_dict(dictionary: SimpleDict, dict_name: str):
-    validate(dict, dictionary, dict_name)
-    if not all([isinstance(key, str) for key in dictionary.keys()]):
-        raise TypeError(f'{dict_name} must be a dict with str keys')
-    if not dict_with_ints(dictionary):
-        raise TypeError(f'{dict_name} must be a dict with int values')
+    if __debug__:
+        validate(dict, dictionary, dict_name)
+        if not all(isinstance(key, str) for key in dictionary):
+            raise TypeError(f'{dict_name} must be a dict with str keys')
+        if not dict_with_ints(dictionary):
+            raise TypeError(f'{dict_name} must be a dict with int values')
 
 
 ###############################################################################
@@ -14,13 +14,17 @@ from typing import Optional, Union
 from warnings import warn
 from core import dict_with_ints, NoteParse, NoteValues, OptionalFloatList, \
                  OptionalIntList, OptionalRatioList, OptionalOutputList, \
-                 OutputTypes, Ratio, ratio_times, ratio_to_cents, \
+                 OutputTypes, Ratio, ratio_to_cents, \
                  SortedAccidentals, validate_bool, validate_dict, \
                  validate_int, validate_str, ValidDict, wrap_octave, \
                  simplify_ratio, ratio_divid, validate_sharp_flat, \
-                 get_keys_for_value, SimpleDict, validate_simple_dict, \
+                 invert_dict, SimpleDict, validate_simple_dict, \
                  limit_ratio, sort_dict_by_value
 
+# Deletes every character that str.split() splits on (all below U+3001)
+WHITESPACE_TABLE = str.maketrans(dict.fromkeys(
+    char for char in map(chr, range(0x3001)) if char.isspace()))
+
 
 class GeneralNotation(object):
     def __init__(self, notes: ValidDict,
@@ -29,14 +33,21 @@ class GeneralNotation(object):
                  simple_accidental: bool = False):
         validate_dict(notes, 'notes')
         self.notes = sort_dict_by_value(notes)
+        self._notes_by_value = invert_dict(self.notes)
         #######################################################################
         if accidentals:
             validate_dict(accidentals, 'accidentals')
             accidents_int = dict_with_ints(accidentals)
         self.accidentals = sort_dict_by_value(accidentals)
         self.sorted_accidentals = None
+        self._accidental_regex = {}
         if self.accidentals:
             self.sorted_accidentals = self._sort_accidentals()
+            # One regex per group to check a note for any of its accidentals
+            self._accidental_regex = {
+                group: re.compile('|'.join(map(re.escape, group_accidentals)))
+                for group, group_accidentals in self.sorted_accidentals.items()
+                if group_accidentals}
         # For validating that a note can't have multiple types of accidentals
         validate_bool(simple_accidental, 'simple_accidental')
         self.simple_accidental = simple_accidental
@@ -50,10 +61,14 @@ class GeneralNotation(object):
         #######################################################################
         # Regex building for note validation, first the character set...
         # valid_notes = list(self.notes.keys())
-        note_names = [(note.upper(), note.title(), note.lower())
-                      for note in self.notes.keys()]
-        flat_names = [name for options in note_names for name in options]
-        valid_notes = list(dict.fromkeys(flat_names))  # removing duplicates
+        # Name variant to canonical name, the first canonical name is kept for
+        # any duplicates. The regex matches the variants and process_note maps
+        # the matched group straight back to the canonical name
+        self._name_variants = {}
+        for note in self.notes.keys():
+            for option in (note.upper(), note.title(), note.lower()):
+                self._name_variants.setdefault(option, note)
+        valid_notes = list(self._name_variants)
         valid_accidental = list()
         if self.accidentals:
             valid_accidental = list(self.accidentals.keys())
@@ -65,30 +80,46 @@ class GeneralNotation(object):
         octaves = octaves if self.use_octaves else list()
         self.valid_chars = frozenset(valid_notes + valid_accidental + octaves)
         #######################################################################
-        # And then we build the regex parser
-        note_groups = '|'.join([f'({note})' for note in valid_notes])
-        # We re.escape(key) in case an accidental is a special symbol
-        accident_reg = f'({"|".join(map(re.escape, accidentals.keys()))})*' \
-            if accidentals else ''
+        # And then we build the regex parser, longest names first since the
+        # regex alternation takes the first option that matches (e.g. 'Des'
+        # before 'D'). We re.escape in case a name or accidental is a special
+        # symbol
+        note_reg = '|'.join(map(re.escape, sorted(valid_notes, key=len,
+                                                  reverse=True)))
+        accident_reg = '|'.join(map(re.escape, sorted(self.accidentals.keys(),
+                                                      key=len, reverse=True)))
+        accident_reg = f'(?:{accident_reg})*' if accident_reg else ''
         negative_octaves = '-' not in self.accidentals.keys()
         if self.use_octaves and not negative_octaves:
             warn('Octaves can\'t be negative when the \'-\' character is also '
                  'being used as an accidental')
-        octaves_reg = '(-?\\d*)' if self.use_octaves and negative_octaves \
-            else '(\\d*)' if self.use_octaves else ''
-        regex = f'({note_groups}){accident_reg}{octaves_reg}'
-        self.note_parser = re.compile(f'({regex})')
+        octaves_reg = '(?:-?\\d+)?' if self.use_octaves and negative_octaves \
+            else '(?:\\d+)?' if self.use_octaves else ''
+        self.note_parser = re.compile(f'(?P<note>{note_reg})'
+                                      f'(?P<accidentals>{accident_reg})'
+                                      f'(?P<octave>{octaves_reg})')
+        #######################################################################
+        # Parsed note strings are memoized, music tends to repeat itself
+        self._value_cache = {}
+        self._values_cache = {}
+        self._accidentals_cache = {}
+        # Matching value types are processed exactly, mixed types in cents
+        self._processors = {int: self._int_process,
+                            float: self._float_process,
+                            tuple: self._tuple_process}
 
     ###########################################################################
     # Tuning systems need all notes in tone row, i.e. nominals for each pitch
     # class within one octave.
     def make_tone_row(self):
+        return sort_dict_by_value(dict(
+            (new_note, self.string_to_value(new_note))
+            for new_note in self._tone_row_notes()))
+
+    def _tone_row_notes(self) -> list:
         all_notes = [note + acc for acc in list(self.accidentals.keys())
                      for note in list(self.notes.keys())]
-        all_notes += list(self.notes.keys())
-        new_dict = dict((new_note, self.string_to_value(new_note))
-                        for new_note in all_notes)
-        return sort_dict_by_value(new_dict)
+        return all_notes + list(self.notes.keys())
 
     ###########################################################################
 
@@ -96,42 +127,44 @@ class GeneralNotation(object):
         return self.string_to_value(note1) == self.string_to_value(note2)
 
     def string_to_value(self, note: str) -> OutputTypes:
+        if note not in self._value_cache:
+            self._value_cache[note] = self._string_to_value(note)
+        return self._value_cache[note]
+
+    def _string_to_value(self, note: str) -> OutputTypes:
         value, accidentals, octave = self.string_to_values(note)
         # NOTE: Behavior of naturals is not what you might expect - naturals
         # should negate prior accidentals - whereas now naturals are just 0
         # and get added on like any other accidental.
         notes_type = self._get_same_type(value, accidentals)
-        if notes_type is int:
-            return self._int_process(value, accidentals, octave)
-        if notes_type is float:
-            return self._float_process(value, accidentals, octave)
-        if notes_type is tuple:
-            return self._tuple_process(value, accidentals, octave)
-        return self._cents_process(value, accidentals, octave)
+        process = self._processors.get(notes_type, self._cents_process)
+        return process(value, accidentals, octave)
 
     @staticmethod
     def _get_same_type(value: OutputTypes,
                        accidentals: OptionalOutputList) -> Union[type, bool]:
         if accidentals:
-            if all([isinstance(acc, type(value)) for acc in accidentals]):
-                return type(value)
+            value_type = type(value)
+            if all(isinstance(acc, value_type) for acc in accidentals):
+                return value_type
             return False
         return type(value)
 
     def _int_process(self, value: int, accidentals: OptionalIntList,
                      octave: Optional[int]) -> int:
-        accidentals = sum(accidentals) if accidentals else 0
-        if self.use_octaves and self.divisions:
-            octave_mod = octave * self.divisions if octave else 0
-            return value + accidentals + octave_mod
-        if self.divisions:
-            return wrap_octave(value + accidentals, self.divisions)
-        return value + accidentals
+        value += sum(accidentals) if accidentals else 0
+        divisions = self.divisions
+        if not divisions:
+            return value
+        if self.use_octaves:
+            return value + octave * divisions if octave else value
+        return wrap_octave(value, divisions)
 
     def _float_process(self, value: float,
                        accidentals: OptionalFloatList,
                        octave: Optional[int]) -> float:
-        accidentals = sum(accidentals) if accidentals else 0.0
+        accidentals = self._accidentals_cents(accidentals) if accidentals \
+            else 0.0
         if self.use_octaves:
             octave_mod = octave * 1200.0 if octave else 0.0
             return value + accidentals + octave_mod
@@ -141,26 +174,37 @@ class GeneralNotation(object):
     def _tuple_process(value: Ratio,
                        accidentals: OptionalRatioList,
                        octave: Optional[int]) -> Ratio:
-        new_ratio = simplify_ratio(value)
+        # NOTE: Multiplying the raw terms and reducing once, the octave is a
+        # power of two so it is a shift of one of the (coprime) terms and only
+        # the factors of two in the other term can cancel with it
+        num, den = value
         if accidentals:
             for mod in accidentals:
-                new_ratio = simplify_ratio(ratio_times(new_ratio, mod))
+                num *= mod[0]
+                den *= mod[1]
+        num, den = simplify_ratio((num, den))
+        if octave and octave < 0:
+            twos = min(-octave, (num & -num).bit_length() - 1)
+            return (num >> twos, den << (-octave - twos))
         if octave:
-            args = (new_ratio, (2**abs(octave), 1))
-            if octave < 0:
-                new_ratio = simplify_ratio(ratio_divid(*args))
-            else:
-                new_ratio = simplify_ratio(ratio_times(*args))
-        return new_ratio
+            twos = min(octave, (den & -den).bit_length() - 1)
+            return (num << (octave - twos), den >> twos)
+        return (num, den)
 
     def _cents_process(self, value: OutputTypes,
                        accidentals: OptionalOutputList,
                        octave: Optional[int]) -> float:
-        mods = sum(self._get_cents(acc)
-                   for acc in accidentals) if accidentals else 0.0
+        mods = self._accidentals_cents(accidentals) if accidentals else 0.0
         octave_mod = octave * 1200.0 if (self.use_octaves and octave) else 0.0
         return self._get_cents(value) + mods + octave_mod
 
+    def _accidentals_cents(self, accidentals: OptionalOutputList) -> float:
+        key = tuple(accidentals)
+        if key not in self._accidentals_cache:
+            self._accidentals_cache[key] = sum(self._get_cents(acc)
+                                               for acc in accidentals)
+        return self._accidentals_cache[key]
+
     def _get_cents(self, value: OutputTypes) -> float:
         if isinstance(value, tuple):
             return ratio_to_cents(value)
@@ -171,6 +215,11 @@ class GeneralNotation(object):
     ###########################################################################
 
     def string_to_values(self, note: str) -> NoteValues:
+        if note not in self._values_cache:
+            self._values_cache[note] = self._string_to_values(note)
+        return self._values_cache[note]
+
+    def _string_to_values(self, note: str) -> NoteValues:
         note_name, accidental_text, octave = self.process_note(note)
         note_value = self.notes[note_name]
         accidental_values = self._convert_accidentals(accidental_text)
@@ -178,57 +227,45 @@ class GeneralNotation(object):
 
     def process_note(self, note: str) -> NoteParse:
         validate_str(note, 'note')
-        note_string = self.validate_note(note)
-        octave, note_string = self._get_octave(note_string)
-        octave = int(octave) if octave else octave
-        note_name = ''
-        for name in self.notes:
-            # NOTE: The options below are in place to allow different styles of
-            # naming to still return the canonical note name. Ex: major and
-            # minor key names often are differentiated by upper and lower case,
-            # and in the case of solfege or some other systems title case may
-            # be more appropriate.
-            for option in (name.upper(), name.title(), name.lower()):
-                # NOTE: Getting the longer name for any note lists that include
-                # accidentals. If a system has note names that can be confused
-                # with it's accidentals, or with other note names, this current
-                # system won't work. (e.g. tonic and supertonic as note names,
-                # lowercase 'b' as a note name and as the flat sign)
-                if option in note_string and len(option) > len(note_name):
-                    note_name = name
-        accidental_text = note_string[len(note_name):]
-        accidental_text = None if accidental_text == '' else accidental_text
+        parse = self._match_note(note)
+        octave = parse.group('octave')
+        octave = int(octave) if octave else None
+        # NOTE: The upper, title, and lower case variants of each name are in
+        # place to allow different styles of naming to still return the
+        # canonical note name. Ex: major and minor key names often are
+        # differentiated by upper and lower case, and in the case of solfege
+        # or some other systems title case may be more appropriate.
+        note_name = self._name_variants[parse.group('note')]
+        accidental_text = parse.group('accidentals') or None
         return (note_name, accidental_text, octave)
 
-    def _get_octave(self, string: str):
-        octave = None
-        while string[-1].isdigit():
-            octave, string = self._octave_digits(string, octave)
-        if '-' not in self.accidentals.keys() and string[-1] == '-':
-            octave, string = string[-1] + octave, string[:-1]
-        return octave, string
-
-    def _octave_digits(self, string: str, octave: Optional[str]):
-        if string[-1].isdigit() and self.use_octaves:
-            octave = string[-1] + (octave if octave else '')
-            return octave, string[:-1]
-        return octave, string
-
     def _convert_accidentals(self, accidental_text:
                              Optional[str]) -> OptionalOutputList:
-        if not self.accidentals or not accidental_text:
+        accidentals = self.accidentals
+        if not accidentals or not accidental_text:
             return None
-        # NOTE: Assumes that an accidental is only one character...
-        return [self.accidentals[accidental] for accidental in accidental_text]
+        # NOTE: Assumes that an accidental is only one character... A tuple
+        # as string_to_values hands out its cached result, keep it immutable
+        return tuple(accidentals[accidental] for accidental in accidental_text)
 
     ###########################################################################
 
     def validate_note(self, note: str) -> str:
-        note_string = ''.join(note.split())
-        self._is_valid_note_string(note_string)
+        return self._match_note(note).group()
+
+    def _match_note(self, note: str) -> re.Match:
+        note_string = note.translate(WHITESPACE_TABLE)
         if self.simple_accidental and self.sorted_accidentals:
             self._limit_accidentals(note_string)
-        return self._parse_note(note_string)
+        parse = self.note_parser.fullmatch(note_string)
+        if not parse:
+            # NOTE: valid_chars is only checked here for a better error message
+            self._is_valid_note_string(note_string)
+            raise ValueError('Notes must be of the form <valid note name>, '
+                             'optionally followed by any number of '
+                             '<accidental>s, optionally followed by an octave '
+                             'number')
+        return parse
 
     def _is_valid_note_string(self, note_string: str):
         valid_note_set = self.valid_chars
@@ -253,16 +290,8 @@ class GeneralNotation(object):
             raise ValueError('Notes may only have one type of accidental')
 
     def _accidental_in_string(self, note: str, group: str) -> bool:
-        return any([acc in note for acc in self.sorted_accidentals[group]])
-
-    def _parse_note(self, note_string: str) -> str:
-        parse = self.note_parser.match(note_string)
-        if not parse:
-            raise ValueError('Notes must be of the form <valid note name>, '
-                             'optionally followed by any number of'
-                             '<accidental>s, optionally followed by an octave '
-                             'number (0-9)')
-        return parse.group()
+        regex = self._accidental_regex.get(group)
+        return bool(regex and regex.search(note))
 
     ###########################################################################
 
@@ -270,7 +299,7 @@ class GeneralNotation(object):
         if not isinstance(value, (int, float, tuple)):
             raise TypeError('value must be of type OutputTypes')
         sharp_flat = validate_sharp_flat(sharp_flat)
-        nominals = get_keys_for_value(value, self.notes)
+        nominals = self._notes_by_value.get(value)
         if nominals:
             return nominals[0]
         for accidental in self.sorted_accidentals[sharp_flat]:
@@ -282,7 +311,7 @@ class GeneralNotation(object):
                     new_value = simplify_ratio(ratio_divid(value, adjust))
             else:
                 new_value = self._get_cents(value) - self._get_cents(adjust)
-            nominals = get_keys_for_value(new_value, self.notes)
+            nominals = self._notes_by_value.get(new_value)
             if nominals:
                 return nominals[0] + accidental
         return False
@@ -317,27 +346,55 @@ class EDONotation(GeneralNotation):
         validate_simple_dict(notes, 'notes')
         super().__init__(notes, accidentals, use_octaves,
                          num_divisions, simple_accidental)
+        # Note name for each pitch class, built per sharp_flat when needed
+        self._note_tables = {}
+        # With int accidentals every note is an int, no need to check types
+        self._int_notes = not self.accidentals or \
+            dict_with_ints(self.accidentals)
+
+    def _string_to_value(self, note: str) -> OutputTypes:
+        if not self._int_notes:
+            return super()._string_to_value(note)
+        return self._int_process(*self.string_to_values(note))
 
     def simplify(self, note: str, sharp_flat: str) -> str:
-        value, mods, octave = self.string_to_values(note)
-        octave = str(octave) if octave else ''
-        nominal_value = wrap_octave(value + sum(mods), self.divisions)
-        return self.get_note_from_value(nominal_value, sharp_flat) + octave
+        # The (cached) value already has the accidentals and octave folded in
+        return self.get_note_from_value(self.string_to_value(note), sharp_flat)
 
     def get_note_from_value(self, value: int, sharp_flat: str) -> str:
         validate_int(value, 'value')
-        octaves = int(value / self.divisions)
-        new_value = value - (octaves * self.divisions)
-        note = self.try_note_from_value(new_value, sharp_flat)
+        return self._note_from_table(value, self._get_note_table(sharp_flat))
+
+    def try_note_from_value(self, value: OutputTypes, sharp_flat: str) -> str:
+        # Pitch classes are resolved once, anything else uses the full search
+        if isinstance(value, int) and 0 <= value < self.divisions:
+            return self._get_note_table(sharp_flat)[value]
+        return super().try_note_from_value(value, sharp_flat)
+
+    def _note_from_table(self, value: int, table: list) -> str:
+        octaves, pitch_class = divmod(value, self.divisions)
         if self.use_octaves:
-            return note + str(octaves)
-        return note
+            return table[pitch_class] + str(octaves)
+        return table[pitch_class]
+
+    def _get_note_table(self, sharp_flat: str) -> list:
+        sharp_flat = validate_sharp_flat(sharp_flat)
+        if sharp_flat not in self._note_tables:
+            try_note = super().try_note_from_value
+            self._note_tables[sharp_flat] = [
+                try_note(pitch_class, sharp_flat)
+                for pitch_class in range(self.divisions)]
+        return self._note_tables[sharp_flat]
 
     ###########################################################################
 
     def translate_values(self, values: list, sharp_flat: str) -> str:
-        return list(self.get_note_from_value(value, sharp_flat)
-                    for value in values)
+        table = self._get_note_table(sharp_flat)
+        notes = list()
+        for value in values:
+            validate_int(value, 'value')
+            notes.append(self._note_from_table(value, table))
+        return notes
 
     def translate_notation(self, notes: list, other_notation,  # : EDONotation
                            sharp_flat: str) -> str:
@@ -355,9 +412,8 @@ class EDONotation(GeneralNotation):
     def make_tone_row(self) -> SimpleDict:
         alphabet = self.notes.copy()
         if self.accidentals:
-            spaces = list(range(self.divisions))
-            for note in self.notes:
-                spaces.remove(self.notes[note])
+            spaces = [space for space in range(self.divisions)
+                      if space not in self._notes_by_value]
             for space in spaces:
                 try_flat = self._apply_accidental(space, 'flat')
                 if try_flat:
@@ -372,8 +428,8 @@ class EDONotation(GeneralNotation):
         # TODO: check [0]
         for accidental in self.sorted_accidentals[sharp_flat][0]:
             adjust = self.accidentals[accidental]
-            new_note_value = wrap_octave(space + adjust, self.divisions)
-            notes = get_keys_for_value(new_note_value, self.notes)
+            new_note_value = wrap_octave(space - adjust, self.divisions)
+            notes = self._notes_by_value.get(new_note_value)
             if notes:
                 return notes[0] + accidental
 
@@ -388,10 +444,12 @@ class JustNotation(GeneralNotation):
         self.limit_to_octave = limit_notes_to_octave
 
     def make_tone_row(self):
-        new_dict = super().make_tone_row()
-        if self.limit_to_octave:
-            new_dict = dict((k, limit_ratio(v)) for k, v in new_dict.items())
-        return sort_dict_by_value(new_dict)
+        if not self.limit_to_octave:
+            return super().make_tone_row()
+        # Limiting while building the row, so it only gets sorted once
+        return sort_dict_by_value(dict(
+            (new_note, limit_ratio(self.string_to_value(new_note)))
+            for new_note in self._tone_row_notes()))
 
 
 ###############################################################################
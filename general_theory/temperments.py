@@ -9,19 +9,26 @@ Definitions of structures for representing pitch classes and various
 tuning systems
 """
 
+from bisect import bisect_right
+from math import ldexp
+from sys import intern
 from typing import Union
-from core import CentsOptions, compare_ratios, Ratio, ratio_to_cents, \
-                 TuningStandard, validate_dict, validate_int, validate_ratio, \
-                 validate_str, ValidDict
+from core import CentsOptions, compare_ratios, limit_ratio, Ratio, \
+                 ratio_to_cents, TuningStandard, validate_dict, validate_int, \
+                 validate_ratio, validate_str, ValidDict
 
 
 class PitchClass(object):
+    # Tuning systems hold many pitch classes, no per-instance __dict__
+    __slots__ = ('name', 'cents', '_ratio')
+
     def __init__(self, name: str, cents: CentsOptions):
         validate_str(name, 'name')
         if not isinstance(cents, (float, int)):
             raise TypeError('cents must be of type float or int')
         self.name = [name]
         self.cents = float(cents)  # above root...
+        self._ratio = 2.0 ** (self.cents / 1200.0)  # ratio above root
 
     def alt_name(self, new_name: str):
         validate_str(new_name, 'new_name')
@@ -31,10 +38,16 @@ class PitchClass(object):
         if not isinstance(root, (float, int)):
             raise TypeError('root must be of type float or int')
         validate_int(octave, 'octave')
-        return pow(2, octave) * (root * pow(2, (self.cents / 1200)))
+        return ldexp(root * self._ratio, octave)  # exact octave shift
 
 
 class EqualPitchClass(PitchClass):
+    __slots__ = ('division', 'divisions')
+
+    # Ratio of each step within one octave for each number of divisions,
+    # shared by every pitch class (all 12EDO systems use the same 12 ratios)
+    _octave_ratios = {}
+
     def __init__(self, name: str, division: int, num_divisions: int):
         validate_int(division, 'division')
         self.division = division
@@ -50,11 +63,21 @@ class EqualPitchClass(PitchClass):
         if not (note_standard and frequency):
             raise TypeError('standard must be of type tuple(int, int|float)')
         octave = octave * self.divisions if octave else 0
-        note = self.division + octave
-        return pow(2, (note - standard[0]) / 12) * standard[1]
+        steps = self.division + octave - standard[0]
+        # NOTE: Tune within one octave and then shift by whole octaves, the
+        # shift is exact (ldexp only changes the exponent)
+        octaves, steps = divmod(steps, self.divisions)
+        if self.divisions not in self._octave_ratios:
+            self._octave_ratios[self.divisions] = tuple(
+                2.0 ** (step / self.divisions)
+                for step in range(self.divisions))
+        ratio = self._octave_ratios[self.divisions][steps]
+        return ldexp(ratio, octaves) * standard[1]
 
 
 class JustPitchClass(PitchClass):
+    __slots__ = ('ratio',)
+
     def __init__(self, name: str, ratio: Ratio):
         validate_ratio(ratio, 'ratio')
         self.ratio = ratio
@@ -67,7 +90,19 @@ class TuningSystem(object):
     def __init__(self, name: str):
         validate_str(name, 'name')
         self.name = name
+        self.clear_pitch_classes()
+
+    def clear_pitch_classes(self):
         self.pitch_classes = []
+        self._cents = []  # cents of each pitch class, to bisect on
+        # Every name (and alt name) to its pitch class. The names are interned
+        # so lookups with the same (interned) string compare by identity
+        self._name_index = {}
+        self._ratios = None  # for tune_all, reset when a pitch class is added
+        # Pitch classes by the signature _same_pitch_class compares them on,
+        # only usable while every pitch class is of the same kind
+        self._signature_index = {}
+        self._kinds = set()
 
     def from_note_dict(self, notes: ValidDict):
         validate_dict(notes, 'notes')
@@ -78,24 +113,29 @@ class TuningSystem(object):
         self.add_pitch_class(PitchClass(name, interval))
 
     def add_pitch_class(self, pitch_class: PitchClass):
-        if isinstance(pitch_class, PitchClass):
+        if not isinstance(pitch_class, PitchClass):
             raise TypeError('pitch_class must be of type PitchClass or it\'s '
                             'subclasses')
-        if self.get_pitch_class(pitch_class.name):
-            raise ValueError('The value in pitch_class.name is already taken '
-                             'in the pitch class list')
+        for name in pitch_class.name:
+            taken = self.get_pitch_class(name)
+            if taken and not self._same_pitch_class(pitch_class, taken):
+                raise ValueError('The value in pitch_class.name is already '
+                                 'taken in the pitch class list')
         added_alt = self._add_alt_name(pitch_class)
         if not added_alt:
-            self.pitch_classes.append(pitch_class)
-        self.pitch_classes.sort(key=lambda x: x.cents)
+            index = bisect_right(self._cents, pitch_class.cents)
+            self._cents.insert(index, pitch_class.cents)
+            self.pitch_classes.insert(index, pitch_class)
+            self._ratios = None
+            for name in pitch_class.name:
+                self._name_index[intern(name)] = pitch_class
+            signature = self._signature(pitch_class)
+            self._signature_index.setdefault(signature, pitch_class)
+            self._kinds.add(signature[0])
 
     def get_pitch_class(self, name: str) -> Union[bool, PitchClass]:
         validate_str(name, 'name')
-        for pitch_class in self.pitch_classes:
-            for pitch_name in pitch_class.name:
-                if name == pitch_name:
-                    return pitch_class
-        return False
+        return self._name_index.get(name, False)
 
     def tune_interval(self, name: str, root: CentsOptions,
                       octave: int) -> float:
@@ -104,15 +144,54 @@ class TuningSystem(object):
             raise ValueError('name not found in pitch_classes')
         return pitch_class.tune_interval(root, octave)
 
+    # Frequencies of every pitch class (in order) for each of the octaves
+    def tune_all(self, root: CentsOptions, octaves: list) -> list:
+        if not isinstance(root, (float, int)):
+            raise TypeError('root must be of type float or int')
+        if self._ratios is None:
+            self._ratios = [pitch_class._ratio
+                            for pitch_class in self.pitch_classes]
+        # tune one octave and then shift it, the same as tune_interval would
+        in_octave = [root * ratio for ratio in self._ratios]
+        tuned = list()
+        for octave in octaves:
+            validate_int(octave, 'octave')
+            tuned.append([ldexp(frequency, octave)
+                          for frequency in in_octave])
+        return tuned
+
     def _add_alt_name(self, new_pitch_class: PitchClass) -> bool:
         if not isinstance(new_pitch_class, PitchClass):
             raise TypeError('new_pitch_class must be of type PitchClass')
-        for index, pitch_class in enumerate(self.pitch_classes):
+        pitch_class = self._find_same_pitch_class(new_pitch_class)
+        if not pitch_class:
+            return False
+        for name in new_pitch_class.name:
+            if name not in pitch_class.name:
+                pitch_class.alt_name(name)
+                self._name_index[intern(name)] = pitch_class
+        return True
+
+    def _find_same_pitch_class(self, new_pitch_class: PitchClass
+                               ) -> Union[bool, PitchClass]:
+        signature = self._signature(new_pitch_class)
+        if self._kinds <= {signature[0]}:
+            return self._signature_index.get(signature, False)
+        # NOTE: Different kinds of pitch classes are compared on cents, so
+        # mixed systems still have to check every pitch class
+        for pitch_class in self.pitch_classes:
             if self._same_pitch_class(new_pitch_class, pitch_class):
-                self.pitch_classes[index].alt_name(new_pitch_class.name)
-                return True
+                return pitch_class
         return False
 
+    @staticmethod
+    def _signature(pitch_class: PitchClass) -> tuple:
+        if isinstance(pitch_class, JustPitchClass):
+            return JustPitchClass, limit_ratio(pitch_class.ratio)
+        if isinstance(pitch_class, EqualPitchClass):
+            return EqualPitchClass, pitch_class.division
+        return PitchClass, pitch_class.cents
+
     def _same_pitch_class(self, pitch1: PitchClass,
                           pitch2: PitchClass) -> bool:
         if self._same_type(pitch1, pitch2, JustPitchClass):
@@ -153,8 +232,7 @@ class EqualTemperment(GeneralTemperment):
         super().__init__(name, 1200 / divisions)
 
     def new_pitch_class(self, name: str, interval: int) -> None:
-        new_cents = interval * self.step_size
-        self.add_pitch_class(EqualPitchClass(name, interval, new_cents))
+        self.add_pitch_class(EqualPitchClass(name, interval, self.divisions))
 
     def tune_standard(self, name: str, standard: TuningStandard,
                       octave: int) -> float:
@@ -7,19 +7,46 @@
 """
 intervals
 """
-from operator import add, sub
-from core import get_keys_for_value, validate_int, validate_str, validate_bool
+import re
+from core import invert_dict, validate_int, validate_str, validate_bool
 from twelve_tone import ChromaticMapNotation
 
 UP = True
 DOWN = False
-OPS = {"+": add, "-": sub, "*": str.__mul__}
+# Splits a (validated) interval into its quality and its interval number
+INTERVAL_PARTS = re.compile(r'([AdMmP]*)(\d*)')
+# One perfect or any number of major, minor, augmented and diminished
+VALID_INTERVAL = re.compile(r'(P|[AdMm]+)([0-9]+)')
+
+
+def _build_quality_table(perfect: dict, major: dict, minor: dict) -> dict:
+    # (simple interval number, semitones) -> quality, for every semitone
+    # value within one octave, e.g. (3, 4) -> 'M' and (4, 3) -> 'dd'
+    table = dict()
+    for interval_num in range(1, 8):
+        if interval_num in perfect:
+            lowest = highest = perfect[interval_num]
+        else:
+            lowest, highest = minor[interval_num], major[interval_num]
+        for value in range(12):
+            if value > highest:
+                quality = 'A' * (value - highest)
+            elif value < lowest:
+                quality = 'd' * (lowest - value)
+            elif interval_num in perfect:
+                quality = 'P'
+            else:
+                quality = 'M' if value == highest else 'm'
+            table[(interval_num, value)] = quality
+    return table
 
 
 class Intervals(object):
     perfect_intervals = {1: 0, 4: 5, 5: 7}
     major_intervals = {2: 2, 3: 4, 6: 9, 7: 11}
     minor_intervals = {2: 1, 3: 3, 6: 8, 7: 10}
+    quality_table = _build_quality_table(perfect_intervals, major_intervals,
+                                         minor_intervals)
     scale_octave = 7
 
     def __init__(self, notation: ChromaticMapNotation):
@@ -29,6 +56,28 @@ class Intervals(object):
         # NOTE: Relying on note names being in order in the dict, not sorting
         # Note names are needed to map scale degrees (1-7) to note names...
         self.note_names = list(self.notation.notes.keys())
+        self._note_positions = dict((note_name, position) for position,
+                                    note_name in enumerate(self.note_names))
+        self._accidentals_by_value = invert_dict(self.notation.accidentals) \
+            if self.notation.accidentals else dict()
+        # Interval lookups are memoized, music tends to repeat itself
+        self._interval_cache = {}
+        self._inversion_cache = {}
+        self._semitones_cache = dict(
+            (interval, self._get_value_for_interval(interval))
+            for interval in self._common_intervals())
+        self._note_cache = {}
+        self._position_cache = {}
+
+    def _common_intervals(self):
+        # Every quality with up to 3 augmentations or diminutions for the
+        # interval numbers 1 to 15, i.e. unison up to a double octave
+        for number in range(1, 16):
+            _, scale_degree = self._simple_scale_degree(number)
+            qualities = ('P',) if scale_degree in self.perfect_intervals \
+                else ('M', 'm')
+            for quality in qualities + ('A', 'AA', 'AAA', 'd', 'dd', 'ddd'):
+                yield quality + str(number)
 
     @classmethod
     def standard(cls):
@@ -47,26 +96,18 @@ class Intervals(object):
     @staticmethod
     def validate_interval(interval: str):
         validate_str(interval, 'interval')
-        if not set(interval) <= frozenset('AdMmP1234567890'):
+        valid = VALID_INTERVAL.fullmatch(interval)
+        if not valid:
             raise ValueError('interval must be made up of a quality (P, M, m, '
-                             'A, d) and an interval number (scale degrees)')
-        letter_digit = False
-        for char in interval:
-            if not char.isdigit():
-                if letter_digit:
-                    raise ValueError('interval must be made of a quality '
-                                     'designation followed by the interval '
-                                     'number, i.e. letters then numbers')
-            else:
-                letter_digit = True
-        if interval[0] == 'P' and interval.count('P') > 1:
-            raise ValueError('interval can only have one P to designate that '
-                             'it is perfect')
+                             'A, d) followed by an interval number (scale '
+                             'degrees), e.g. P5, m3, or AA4')
+        if int(valid.group(2)) < 1:
+            raise ValueError('interval number must be at least 1 (unison)')
 
     @staticmethod
     def validate_interval_list(interval_list: list):
-        if not isinstance(interval_list, list):
-            raise TypeError('interval_list must be of type list')
+        if not isinstance(interval_list, (list, tuple)):
+            raise TypeError('interval_list must be of type list or tuple')
         for interval in interval_list:
             try:
                 Intervals.validate_interval(interval)
@@ -78,9 +119,32 @@ class Intervals(object):
 
     def get_interval(self, note1: str, note2: str, octaves: int = 0,
                      direction: bool = UP) -> str:
+        validate_int(octaves, 'octaves')  # before the cache, 1.0 == 1 etc.
+        key = (note1, note2, octaves, direction)
+        if key not in self._interval_cache:
+            self._interval_cache[key] = self._get_interval_between(*key)
+        return self._interval_cache[key]
+
+    # Pairwise intervals for two equal length lists of notes, e.g. between
+    # every note of a melody and the next: get_intervals(notes[:-1], notes[1:])
+    def get_intervals(self, notes1: list, notes2: list, octaves: int = 0,
+                      direction: bool = UP) -> list:
+        if len(notes1) != len(notes2):
+            raise ValueError('notes1 and notes2 must be the same length')
+        validate_int(octaves, 'octaves')
+        interval_cache = self._interval_cache
+        intervals = list()
+        for note1, note2 in zip(notes1, notes2):
+            key = (note1, note2, octaves, direction)
+            if key not in interval_cache:
+                interval_cache[key] = self._get_interval_between(*key)
+            intervals.append(interval_cache[key])
+        return intervals
+
+    def _get_interval_between(self, note1: str, note2: str, octaves: int,
+                              direction: bool) -> str:
         value1 = self.notation.string_to_value(note1)
         value2 = self.notation.string_to_value(note2)
-        validate_int(octaves, 'octaves')
         value = ((value2 - value1) % 12) + (octaves * 12)
         interval_name = self._get_interval(note1, note2, value)
         if direction:
@@ -91,53 +155,44 @@ class Intervals(object):
         validate_int(value, 'value')
         if value < 0:
             raise ValueError('value must be a positive int')
-        if value < 12:
-            return self._get_simple_interval_for_notes(note1, note2, value)
-        # if value >= 12:  <-- this is implied
-        octaves = int(value / 12)
-        value = value - (octaves * 12)
+        octaves, value = divmod(value, 12)
         simple = self._get_simple_interval_for_notes(note1, note2, value)
+        if not octaves:
+            return simple
         return simple[:-1] + str(int(simple[-1]) + (octaves * 7))
 
     def _get_simple_interval_for_notes(self, note1: str, note2: str,
                                        value: int) -> str:
-        def expander(interval_val: int, qual: str) -> str:
-            oper = '*' if value != interval_val else None
-            return OPS[oper](qual, abs(value - interval_val)) if oper else qual
         interval_num = self._simple_interval_number(note1, note2)
-        if interval_num in self.perfect_intervals:
-            interval_value = self.perfect_intervals[interval_num]
-            quality = 'P' if value == interval_value else \
-                      'A' if value > interval_value else 'd'
-            quality = expander(interval_value, quality)
-        else:
-            major_int_value = self.major_intervals[interval_num]
-            minor_int_value = self.minor_intervals[interval_num]
-            quality = 'A' if value > major_int_value else \
-                      'M' if value == major_int_value else \
-                      'm' if value == minor_int_value else 'd'
-            quality = expander(major_int_value, quality) if quality == 'A' \
-                else expander(minor_int_value, quality)
-        return quality + str(interval_num)
+        return self.quality_table[(interval_num, value)] + str(interval_num)
 
     def _simple_interval_number(self, note1, note2):
-        note1_name, _, _ = self.notation.process_note(note1)
-        note2_name, _, _ = self.notation.process_note(note2)
-        note1_value = self.note_names.index(note1_name) + 1
-        note2_value = self.note_names.index(note2_name) + 1
+        note1_value = self._note_position(note1) + 1
+        note2_value = self._note_position(note2) + 1
         if note1_value == note2_value:
             return 1
         if note1_value < note2_value:
             return (note2_value - note1_value) + 1
         return 8 - (note1_value - note2_value)
 
+    def _note_position(self, note: str) -> int:
+        # Position of the note's name in note_names, parsing each note once
+        if note not in self._position_cache:
+            note_name, _, _ = self.notation.process_note(note)
+            self._position_cache[note] = self._note_positions[note_name]
+        return self._position_cache[note]
+
     ###########################################################################
 
     def get_inversion(self, interval: str):
+        if interval not in self._inversion_cache:
+            self._inversion_cache[interval] = self._get_inversion(interval)
+        return self._inversion_cache[interval]
+
+    def _get_inversion(self, interval: str):
         self.validate_interval(interval)
         mods, scale_degree = self._split_interval(interval)
-        octaves = int(scale_degree / 7)
-        scale_degree = scale_degree - (octaves * 7)
+        octaves, scale_degree = self._simple_scale_degree(scale_degree)
         if scale_degree == 1 and octaves == 1:
             scale_degree = 8
         replacements = ('A', 'd') if mods[0] == 'A' else \
@@ -148,57 +203,90 @@ class Intervals(object):
 
     @staticmethod
     def _split_interval(interval: str):
-        # NOTE: Don't know why I did the index search like this...
-        number_index = sum([1 for char in interval if not char.isdigit()])
-        return interval[:number_index], int(interval[number_index:])
+        mods, number = INTERVAL_PARTS.match(interval).groups()
+        return mods, int(number)
+
+    @staticmethod
+    def _simple_scale_degree(scale_degree: int):
+        # Compound interval numbers to (octaves, 1-7), e.g. 7 -> (0, 7) and
+        # 8 -> (1, 1) (the octave)
+        octaves, scale_degree = divmod(scale_degree - 1, 7)
+        return octaves, scale_degree + 1
 
     ###########################################################################
 
     def get_semitones(self, interval: str):
-        self.validate_interval(interval)
-        return self._get_value_for_interval(interval)
+        # NOTE: The cache starts out with the common intervals up to two
+        # octaves, see _common_intervals
+        if interval not in self._semitones_cache:
+            self.validate_interval(interval)
+        return self._get_semitones(interval)
+
+    # NOTE: Unchecked, only for intervals that have already been validated
+    # (or were produced by this class, e.g. by get_interval)
+    def _get_semitones(self, interval: str):
+        if interval not in self._semitones_cache:
+            value = self._get_value_for_interval(interval)
+            self._semitones_cache[interval] = value
+        return self._semitones_cache[interval]
 
     def _get_value_for_interval(self, interval):
         mods, scale_degree = self._split_interval(interval)
-        octaves = int(scale_degree / 7)
-        scale_degree = scale_degree - (octaves * 7)
+        octaves, scale_degree = self._simple_scale_degree(scale_degree)
         if scale_degree in self.perfect_intervals:
             int_value = self.perfect_intervals[scale_degree]
         elif mods[0] == 'A' or mods[0] == 'M':
             int_value = self.major_intervals[scale_degree]
         elif mods[0] == 'm' or mods[0] == 'd':
             int_value = self.minor_intervals[scale_degree]
-        oper = '+' if mods[0] == 'A' else '-' if mods[0] == 'd' else None
-        int_value = OPS[oper](int_value, len(mods)) if oper else int_value
+        if mods[0] == 'A':
+            int_value += len(mods)
+        elif mods[0] == 'd':
+            int_value -= len(mods)
         return int_value + (octaves * 12)
 
     def get_note_by_interval(self, note: str, interval: str,
                              direction: bool = UP):
-        validate_bool(direction, 'direction')
-        self.validate_interval(interval)
+        validate_bool(direction, 'direction')  # before the cache, 1 == True
+        key = (note, interval, direction)
+        if key not in self._note_cache:
+            self.validate_interval(interval)
+            self._note_cache[key] = self._get_note_by_interval(*key)
+        return self._note_cache[key]
+
+    def _get_note_by_interval(self, note: str, interval: str,
+                              direction: bool):
+        steps, interval_value = self._interval_steps(interval)
+        _, _, new_note = self._spell_note(self._note_position(note),
+                                          self.notation.string_to_value(note),
+                                          steps, interval_value, direction)
+        return new_note
+
+    def _interval_steps(self, interval: str):
+        # Scale degree steps and the semitones within one octave, e.g. a M10
+        # is 9 steps (letter names) and 4 semitones
         _, scale_degree = self._split_interval(interval)  # 8 for octave...
-        interval_value = self._get_value_for_interval(interval)  # semitones
-        # shrink interval_value down to be within one octave...
-        interval_value = interval_value - (int(scale_degree / 7) * 12)
-        # get scale degree from the list of 'in order' note names...
-        note_name, _, _ = self.notation.process_note(note)
-        note_position = self.note_names.index(note_name)
-        new_note_position = OPS['+' if direction else '-'](note_position,
-                                                           (scale_degree - 1))
-        new_note_letter = self.note_names[new_note_position % 7]
+        octaves, _ = self._simple_scale_degree(scale_degree)
+        return scale_degree - 1, self._get_semitones(interval) - octaves * 12
+
+    def _spell_note(self, note_position: int, note_value: int, steps: int,
+                    interval_value: int, direction: bool):
+        # Works on a note's position in note_names and its value only, no
+        # note strings get parsed. Returns the same for the new note too.
+        new_note_position = (note_position + steps if direction
+                             else note_position - steps) % 7
+        new_note_letter = self.note_names[new_note_position]
+        letter_value = self.notation.notes[new_note_letter]
         if direction:  # Up...
-            current_interval = (self.notation.notes[new_note_letter]
-                                - self.notation.string_to_value(note)) % 12
-            adjust = interval_value - current_interval
+            adjust = interval_value - ((letter_value - note_value) % 12)
         else:
-            current_interval = (self.notation.string_to_value(note)
-                                - self.notation.notes[new_note_letter]) % 12
-            adjust = current_interval - interval_value
+            adjust = ((note_value - letter_value) % 12) - interval_value
+        new_note_value = letter_value + adjust
         if adjust != 0:
-            accidental = get_keys_for_value(-1 if adjust < 0 else 1,
-                                            self.notation.accidentals)[0]
-            return new_note_letter + (accidental * abs(adjust))
-        return new_note_letter
+            step = -1 if adjust < 0 else 1
+            accidental = self._accidentals_by_value[step][0]
+            new_note_letter += accidental * abs(adjust)
+        return new_note_position, new_note_value, new_note_letter
 
     ###########################################################################
 
@@ -209,12 +297,11 @@ class Intervals(object):
                              int2_oct: int = 0, int2_direct: bool = UP):
         int1 = self.get_interval(int1_note1, int1_note2, int1_oct, int1_direct)
         int2 = self.get_interval(int2_note1, int2_note2, int2_oct, int2_direct)
-        semitone_equal = self.get_semitones(int1) == self.get_semitones(int2)
-        enharmonics1 = self.notation.enharmonics(int1_note1, int1_note2)
-        enharmonics2 = self.notation.enharmonics(int2_note1, int2_note2)
-        if all((semitone_equal, enharmonics1, enharmonics2)):
-            return True
-        return False
+        # NOTE: Short circuits, the notes were all parsed by get_interval and
+        # int1 and int2 are valid intervals so skip validating them again
+        return self._get_semitones(int1) == self._get_semitones(int2) and \
+            self.notation.enharmonics(int1_note1, int1_note2) and \
+            self.notation.enharmonics(int2_note1, int2_note2)
 
     ###########################################################################
 
@@ -224,16 +311,23 @@ class Intervals(object):
         self.notation.validate_note(tonic)
         self.validate_interval_list(interval_list)
         validate_bool(mirrored, 'mirrored')
+        validate_bool(direction, 'direction')
+        # NOTE: The tonic is parsed once, every other note is worked out from
+        # the previous (or root) note's position and value, not its string
+        position = self._note_position(tonic)
+        value = self.notation.string_to_value(tonic)
         notes = [tonic]
         for interval in interval_list:
-            notes.append(self.get_note_by_interval(tonic if from_root else
-                                                   notes[-1], interval,
-                                                   direction))
+            new_position, new_value, new_note = self._spell_note(
+                position, value, *self._interval_steps(interval), direction)
+            notes.append(new_note)
+            if not from_root:
+                position, value = new_position, new_value
         return self.mirror(notes) if mirrored else notes
 
     @staticmethod
     def mirror(note_list: list):
-        return note_list[:-1] + list(reversed(note_list))
+        return note_list[:-1] + note_list[::-1]
 
     # TODO: add an identify interval stack function so a list of notes can be
     # passed in and the intervals between each note can be returned OR compared
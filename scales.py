@@ -9,79 +9,88 @@ scales
 """
 
 from intervals import Intervals, UP, DOWN
-from core import validate_str
+from core import validate_bool, validate_str
 from twelve_tone import ChromaticMapNotation
 
+# steps only applies to heptatonic scales using each scale degree once.
+STEP_INTERVALS = {'W': 'M2', 'H': 'm2', '3H': 'A2'}
+
 
 class Scales(object):
     named_scales = {
-        'major':                list('WWHWWWH'),
-        'minor':                list('WHWWHWW'),  # natural minor
-        'harmonic minor':       'W-H-W-W-H-3H-H'.split('-'),
-        'harmonic major':       'W-W-H-W-H-3H-H'.split('-'),
-        'melodic minor asc':    list('WHWWWWH'),
+        'major':                tuple('WWHWWWH'),
+        'minor':                tuple('WHWWHWW'),  # natural minor
+        'harmonic minor':       tuple('W-H-W-W-H-3H-H'.split('-')),
+        'harmonic major':       tuple('W-W-H-W-H-3H-H'.split('-')),
+        'melodic minor asc':    tuple('WHWWWWH'),
         # descending is same as natural minor (reversed order)
-        'melodic minor desc':   list('WWHWWHW'),
-        'ionian':               list('WWHWWWH'),  # same as major
-        'dorian':               list('WHWWWHW'),
-        'phrygian':             list('HWWWHWW'),
-        'lydian':               list('WWWHWWH'),
-        'mixolydian':           list('WWHWWHW'),
-        'aeolian':              list('WHWWHWW'),  # same as minor
-        'locrian':              list('HWWHWWW'),
+        'melodic minor desc':   tuple('WWHWWHW'),
+        'ionian':               tuple('WWHWWWH'),  # same as major
+        'dorian':               tuple('WHWWWHW'),
+        'phrygian':             tuple('HWWWHWW'),
+        'lydian':               tuple('WWWHWWH'),
+        'mixolydian':           tuple('WWHWWHW'),
+        'aeolian':              tuple('WHWWHWW'),  # same as minor
+        'locrian':              tuple('HWWHWWW'),
         #######################################################################
-        'double harmonic':      'H-3H-H-W-H-3H-H'.split('-'),
+        'double harmonic':      tuple('H-3H-H-W-H-3H-H'.split('-')),
         # Hungarian minor is the dorian mode of the double harmonic
-        'hungarian minor':      'W-H-3H-H-H-3H-H'.split('-'),
-        'hungarian major':      '3H-H-W-H-W-H-W'.split('-'),
+        'hungarian minor':      tuple('W-H-3H-H-H-3H-H'.split('-')),
+        'hungarian major':      tuple('3H-H-W-H-W-H-W'.split('-')),
         # not sure which type... gypsy is not a great name for this
-        'gypsy':                'W-H-3H-H-H-W-W'.split('-'),
+        'gypsy':                tuple('W-H-3H-H-H-W-W'.split('-')),
         # Modes of harmonic minor
-        'ukrainian dorian':     'W-H-3H-H-W-H-W'.split('-'),
-        'phrygian dominant':    'H-3H-H-W-H-W-W'.split('-'),
+        'ukrainian dorian':     tuple('W-H-3H-H-W-H-W'.split('-')),
+        'phrygian dominant':    tuple('H-3H-H-W-H-W-W'.split('-')),
         #######################################################################
         # jazz minor is the same as melodic minor asc
-        'jazz minor':           list('WHWWWWH'),
-        'blues':                'm3-W-H-A1-m3-W'.split('-'),
-        'bebop':                'W-W-H-W-W-H-A1-H'.split('-'),
+        'jazz minor':           tuple('WHWWWWH'),
+        'blues':                tuple('m3-W-H-A1-m3-W'.split('-')),
+        'bebop':                tuple('W-W-H-W-W-H-A1-H'.split('-')),
         # in A1-H in the major bebop scale, the A1 is played as an
         # ornamentation/pickup
-        'major bebop':          'W-W-H-W-A1-H-W-H'.split('-'),
-        'flamenco':             'H-3H-H-W-H-3H-H'.split('-'),
-        'neapolitan minor':     'H-W-W-W-H-3H-H'.split('-'),
-        'neapolitan major':     list('HWWWWWH'),
+        'major bebop':          tuple('W-W-H-W-A1-H-W-H'.split('-')),
+        'flamenco':             tuple('H-3H-H-W-H-3H-H'.split('-')),
+        'neapolitan minor':     tuple('H-W-W-W-H-3H-H'.split('-')),
+        'neapolitan major':     tuple('HWWWWWH'),
         #######################################################################
-        'hirajoshi':            'M3-W-H-M3-H'.split('-'),
-        'in':                   'H-M3-W-H-M3'.split('-'),
-        'insen':                'H-M3-W-m3-W'.split('-'),
-        'iwato':                'H-M3-H-M3-W'.split('-'),
-        'yo':                   'm3-W-W-m3-W'.split('-'),
+        'hirajoshi':            tuple('M3-W-H-M3-H'.split('-')),
+        'in':                   tuple('H-M3-W-H-M3'.split('-')),
+        'insen':                tuple('H-M3-W-m3-W'.split('-')),
+        'iwato':                tuple('H-M3-H-M3-W'.split('-')),
+        'yo':                   tuple('m3-W-W-m3-W'.split('-')),
         #######################################################################
-        'persian':              'H-3H-H-H-W-3H-H'.split('-'),
-        'enigmatic':            'H-3H-W-W-W-H-H'.split('-'),
-        'harmonics':            'm3-A1-H-W-W-m3'.split('-'),
-        'acoustic':             list('WWWHWHW'),
-        'augmented':            'm3-A1-m3-A1-m3-H'.split('-'),
-        'half diminished':      list('WHWHWWW'),
-        'super locrian':        list('HWHWWWW'),  # altered scale..
-        'lydian augmented':     list('WWWWHWH'),
-        'major locrian':        list('WWHHWWW'),
+        'persian':              tuple('H-3H-H-H-W-3H-H'.split('-')),
+        'enigmatic':            tuple('H-3H-W-W-W-H-H'.split('-')),
+        'harmonics':            tuple('m3-A1-H-W-W-m3'.split('-')),
+        'acoustic':             tuple('WWWHWHW'),
+        'augmented':            tuple('m3-A1-m3-A1-m3-H'.split('-')),
+        'half diminished':      tuple('WHWHWWW'),
+        'super locrian':        tuple('HWHWWWW'),  # altered scale..
+        'lydian augmented':     tuple('WWWWHWH'),
+        'major locrian':        tuple('WWHHWWW'),
         #######################################################################
         # octatonic is any 8 note scale, but these are generated
         # when you alternate whole and half steps
-        'octatonic whole':      'W-H-W-H-W-A1-W-H'.split('-'),
-        'octatonic half':       'H-W-A1-W-H-W-H'.split('-'),
-        'prometheus':           'W-W-W-m3-H-W'.split('-'),
-        'tritone':              'H-3H-W-A1-m3-W'.split('-'),
-        'two semitone tritone': 'H-A1-M3-H-H-M3'.split('-'),
-        'whole tone':           list('WWWWWW')
+        'octatonic whole':      tuple('W-H-W-H-W-A1-W-H'.split('-')),
+        'octatonic half':       tuple('H-W-A1-W-H-W-H'.split('-')),
+        'prometheus':           tuple('W-W-W-m3-H-W'.split('-')),
+        'tritone':              tuple('H-3H-W-A1-m3-W'.split('-')),
+        'two semitone tritone': tuple('H-A1-M3-H-H-M3'.split('-')),
+        'whole tone':           tuple('WWWWWW')
     }
+    # allow for mixed intervals, not limiting to heptatonic
+    scale_intervals = dict((name, tuple(STEP_INTERVALS.get(step, step)
+                                        for step in steps))
+                           for name, steps in named_scales.items())
 
     def __init__(self, notation: ChromaticMapNotation):
         if not isinstance(notation, ChromaticMapNotation):
             raise TypeError('notation must be of type ChromaticMapNotation')
         self.notation = notation
         self.intervals = Intervals(notation)
+        self._scale_cache = {}
+        self._chromatic_cache = {}
 
     @classmethod
     def standard(cls):
@@ -100,35 +109,50 @@ class Scales(object):
     def named_scale(self, scale_name: str, tonic: str, direction: bool = UP,
                     mirrored: bool = False):
         validate_str(scale_name, 'scale_name')
-        if scale_name.lower() not in self.named_scales:
-            raise ValueError('scale_name is not in dictionary of known scales '
-                             'and modes')
-        scale = self._steps_to_interval(self.named_scales[scale_name])
-        return self.intervals.stack_intervals(tonic, scale, False,  # from_root
+        # before the cache, 1 == True
+        validate_bool(direction, 'direction')
+        validate_bool(mirrored, 'mirrored')
+        # Only lower() names that aren't already a known (lowercase) scale
+        if scale_name not in self.named_scales:
+            scale_name = scale_name.lower()
+            if scale_name not in self.named_scales:
+                raise ValueError('scale_name is not in dictionary of known '
+                                 'scales and modes')
+        key = (scale_name, tonic, direction, mirrored)
+        if key not in self._scale_cache:
+            self._scale_cache[key] = self._named_scale(*key)
+        return list(self._scale_cache[key])  # copy, the cache isn't shared
+
+    def _named_scale(self, scale_name: str, tonic: str, direction: bool,
+                     mirrored: bool):
+        return self.intervals.stack_intervals(tonic,
+                                              self.scale_intervals[scale_name],
+                                              False,  # from_root
                                               direction, mirrored)
 
-    @staticmethod
-    def _steps_to_interval(heptatonic: list):
-        # steps only applies to heptatonic scales using each scale degree once.
-        steps = {'W': 'M2', 'H': 'm2', '3H': 'A2'}
-        # allow for mixed intervals, not limiting to heptatonic
-        return [steps[step] if step in steps else step for step in heptatonic]
-
     ###########################################################################
 
     def chromatic_scale(self, tonic: str, sharp_flat: str,
                         direction: bool = UP, mirrored: bool = False):
         start = self.notation.string_to_value(tonic)
-        notes = list(range(12))
-        notes = notes[start:] + notes[:start]
-        notes.append(start)
-        notes = reversed(notes) if not direction else notes
-        note_names = [self.notation.get_note_from_value(note, sharp_flat)
-                      for note in notes]
+        key = (start, sharp_flat, direction)
+        if key not in self._chromatic_cache:
+            self._chromatic_cache[key] = self._chromatic_scale(*key)
+        note_names = list(self._chromatic_cache[key])  # copy, not shared
         if mirrored:
             return self.intervals.mirror(note_names)
         return note_names
 
+    def _chromatic_scale(self, start: int, sharp_flat: str,
+                         direction: bool):
+        # From the tonic's value in either direction, so the octave numbers
+        # keep changing past B/C (and a tonic below C0, e.g. Cb, starts in
+        # octave -1)
+        notes = range(start, start + 13) if direction \
+            else range(start, start - 13, -1)
+        # one pass over the notation's pitch class table for the whole scale
+        return self.notation.translate_values(notes, sharp_flat)
+
     ###########################################################################
 
     def major_scale(self, tonic: str, direction: bool = UP,
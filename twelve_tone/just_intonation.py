@@ -4,6 +4,7 @@
 # @Author:      Samuel Hill
 # @Email:       whatinthesamhill@protonmail.com
 
+from core import validate_sharp_flat
 from general_theory import JustIntonation, JustNotation
 from .chromatic_map import ChromaticMapNotation
 
@@ -59,28 +60,40 @@ class PtolemyChromatic(JustIntonation):
         super().__init__('Ptolemy 12 general')
         self.notation = ChromaticMapNotation.standard()
         self.offset = 0
+        # Only 12 keys to transpose to, each spelled with sharps or flats
+        self._transpositions = dict(
+            ((position, sharp_flat), self._transpose(position, sharp_flat))
+            for position in range(12) for sharp_flat in ('sharp', 'flat'))
         self.from_note_dict(self.notes)
 
+    def from_note_dict(self, notes: dict):
+        super().from_note_dict(notes)
+        # Names of the current pitch classes, in order from the key
+        self._note_names = tuple(notes)
+        self._enharmonic_cache = {}
+
     def tune(self, name: str, root: int = 256, octave: int = 0) -> float:
         return self.tune_interval(self._enharmonic_name(name), root, octave)
 
     def _enharmonic_name(self, name: str) -> str:
-        position = self.notation.string_to_value(name)
-        return list(self.notes.keys())[position + self.offset]
+        if name not in self._enharmonic_cache:
+            position = self.notation.string_to_value(name) - self.offset
+            self._enharmonic_cache[name] = self._note_names[position % 12]
+        return self._enharmonic_cache[name]
 
     def transpose(self, new_key: str, sharp_flat: str):
         # NOTE: doesn't shift root for tuning.
-        new_notes, offset = self._transpose(new_key, sharp_flat)
-        self.offset = offset
-        self.pitch_classes = []
+        position = self.notation.string_to_value(new_key) % 12
+        new_notes = self._transpositions[(position,
+                                          validate_sharp_flat(sharp_flat))]
+        self.offset = position
+        self.clear_pitch_classes()
         self.from_note_dict(new_notes)
 
-    def _transpose(self, new_key: str, sharp_flat: str):
-        position = self.notation.string_to_value(new_key)
-        pos_list = list(range(12))[position:] + list(range(12))[:position]
-        new_keys = [self.notation.get_note_from_value(pos, sharp_flat)
-                    for pos in pos_list]
-        return dict(zip(new_keys, self.notes.values())), position
+    def _transpose(self, position: int, sharp_flat: str):
+        new_keys = self.notation.translate_values(
+            [(position + step) % 12 for step in range(12)], sharp_flat)
+        return dict(zip(new_keys, self.notes.values()))
 
 
 class PythagoreanCTuning(JustIntonation):
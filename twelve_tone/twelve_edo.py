@@ -4,6 +4,8 @@
 # @Author:      Samuel Hill
 # @Email:       whatinthesamhill@protonmail.com
 
+from array import array
+from core import validate_int
 from general_theory import EqualTemperment
 from .chromatic_map import ChromaticMapNotation
 
@@ -14,23 +16,103 @@ class EqualDivisionsOctave12(EqualTemperment):
 
 
 class MidiStandard(EqualDivisionsOctave12):
+    # 69 = A4 (in scientific pitch notation), midi standard defines 0 as a
+    # C one full octave below what the ASPN considers C0. This means that
+    # A (9 semitones up from C) needs 5 octaves in midi (5 * 12 = 60) to
+    # equal A4. This discrepancy is addressed in scientific_octaves(...).
+    # For more see: https://en.wikipedia.org/wiki/Scientific_pitch_notation
+    tuning_standard = (69, 440)
+    _tone_row = None  # every name for every pitch class, built once
+
     def __init__(self):
         super().__init__('Midi')
-        # TODO: add ALL representations in ChromaticMapNotation for more
-        # alt_names, giving us translation auto-magically...
-        self.from_note_dict(ChromaticMapNotation.standard().make_tone_row())
-        self.from_note_dict(ChromaticMapNotation.unicode().make_tone_row())
-        self.from_note_dict(ChromaticMapNotation.solfege().make_tone_row())
-        self.from_note_dict(ChromaticMapNotation.s_unicode().make_tone_row())
-        # 69 = A4 (in scientific pitch notation), midi standard defines 0 as a
-        # C one full octave below what the ASPN considers C0. This means that
-        # A (9 semitones up from C) needs 5 octaves in midi (5 * 12 = 60) to
-        # equal A4. This discrepancy is addressed in scientific_octaves(...).
-        # For more see: https://en.wikipedia.org/wiki/Scientific_pitch_notation
-        self.tuning_standard = (69, 440)
+        self.from_note_dict(self._get_tone_row())
+        # Frequency of every midi note (0-127), tune looks these up
+        self._midi_standard = self.tuning_standard
+        self._midi_frequencies = self._tune_midi_notes(self.tuning_standard)
+        # Scores repeat the same notes a lot, the cache starts out with every
+        # name at every octave in the midi range for the standard
+        self._tune_cache = dict(
+            ((name, octave, self.tuning_standard), frequency)
+            for name, octave, frequency in self._midi_names())
+
+    @classmethod
+    def _get_tone_row(cls) -> dict:
+        # NOTE: The notations are the same for every instance, only build
+        # their tone rows the first time. from_note_dict doesn't change it.
+        if cls._tone_row is None:
+            # TODO: add ALL representations in ChromaticMapNotation for more
+            # alt_names, giving us translation auto-magically...
+            # NOTE: Merged into one dict and added in one pass, the first name
+            # for each pitch class (standard) stays its main name
+            tone_row = dict()
+            for notation in (ChromaticMapNotation.standard(),
+                             ChromaticMapNotation.unicode(),
+                             ChromaticMapNotation.solfege(),
+                             ChromaticMapNotation.s_unicode()):
+                tone_row.update(notation.make_tone_row())
+            cls._tone_row = tone_row
+        return cls._tone_row
+
+    def _tune_midi_notes(self, standard: tuple) -> array:
+        # NOTE: pitch_classes are in order, one for each of the 12 divisions.
+        # Kept as packed doubles, not float32, so tune's results don't change
+        return array('d', (self.pitch_classes[division].tune_standard(
+                               standard, octave)
+                           for octave, division in map(divmod, range(128),
+                                                       [12] * 128)))
+
+    def _midi_names(self):
+        for name, pitch_class in self._name_index.items():
+            for octave in range(11):
+                midi_note = pitch_class.division + octave * 12
+                if midi_note < 128:
+                    yield name, octave, self._midi_frequencies[midi_note]
 
     def tune(self, name: str, octave: int = 5):
-        return self.tune_standard(name, self.tuning_standard, octave)
+        validate_int(octave, 'octave')  # before the cache, 1.0 == 1 etc.
+        return self._cached_tune(name, octave)
+
+    def _cached_tune(self, name: str, octave: int):
+        tune_cache = self._tune_cache
+        key = (name, octave, self.tuning_standard)
+        if key not in tune_cache:
+            tune_cache[key] = self._tune(*key)
+        return tune_cache[key]
+
+    # Frequencies for pairs of names and octaves, e.g. every note in a score
+    def tune_many(self, names: list, octaves: list) -> list:
+        return self._tune_pairs(names, octaves, 0)
+
+    def _tune_pairs(self, names: list, octaves: list, offset: int) -> list:
+        # offset is added to every (validated) octave, 1 for scientific
+        if len(names) != len(octaves):
+            raise ValueError('names and octaves must be the same length')
+        standard = self.tuning_standard
+        tune_cache = self._tune_cache
+        frequencies = list()
+        for name, octave in zip(names, octaves):
+            validate_int(octave, 'octave')
+            key = (name, octave + offset, standard)
+            if key not in tune_cache:
+                tune_cache[key] = self._tune(*key)
+            frequencies.append(tune_cache[key])
+        return frequencies
+
+    def _tune(self, name: str, octave: int, standard: tuple):
+        pitch_class = self.get_pitch_class(name)
+        if not pitch_class:
+            raise ValueError('name not found in pitch_classes')
+        midi_note = pitch_class.division + octave * 12
+        # Falls back if the note is outside midi or the standard was changed
+        if 0 <= midi_note < 128 and standard == self._midi_standard:
+            return self._midi_frequencies[midi_note]
+        return pitch_class.tune_standard(standard, octave)
 
     def scientific_octaves(self, name: str, octave: int):
-        return self.tune(name, octave + 1)
+        validate_int(octave, 'octave')
+        return self._cached_tune(name, octave + 1)
+
+    # Same as tune_many, with scientific pitch notation octaves
+    def scientific_octaves_many(self, names: list, octaves: list) -> list:
+        return self._tune_pairs(names, octaves, 1)